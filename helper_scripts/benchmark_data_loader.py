@@ -0,0 +1,69 @@
+"""
+Training steps/s of the Keras regressor on CPU: naive in-memory loading (pd.read_csv then fit on arrays)
+against the streaming tf.data loader. Uses the hourly train split if it exists, else a synthetic csv.
+On a single core the parsing cannot overlap with the training step, the gain comes with several cores.
+Run from the repository root: python -m helper_scripts.benchmark_data_loader
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.keras_mlp import KerasMLPModel
+from src.preprocessing.extract_constants import target_column
+from src.training.data_loader import get_split_paths, make_csv_dataset
+from src.utils.configs.data_config import parse_config
+from src.utils.utils import load_yaml
+
+BATCH_SIZE = 256
+EPOCHS = 3
+
+
+def make_synthetic_csv(path: Path, nb_rows: int = 200_000, nb_features: int = 20) -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((nb_rows, nb_features)), columns=[f"f{i}" for i in range(nb_features)])
+    df[target_column] = rng.integers(0, 977, nb_rows)
+    df.to_csv(path, index=False)
+
+
+def naive(paths: list[Path]) -> tuple[float, int]:
+    start = time.perf_counter()
+    df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    x = df.drop(columns=[target_column]).to_numpy(dtype=np.float32)
+    y = df[target_column].to_numpy(dtype=np.float32)
+
+    model = KerasMLPModel({"epochs": EPOCHS, "batch_size": BATCH_SIZE})
+    model.train_regressor(x, y)
+    steps = EPOCHS * int(np.ceil(len(x) / BATCH_SIZE))
+    return time.perf_counter() - start, steps
+
+
+def streaming(paths: list[Path], cache: bool = False) -> tuple[float, int]:
+    nb_rows = sum(len(pd.read_csv(path, usecols=[target_column])) for path in paths)
+    steps = EPOCHS * int(np.ceil(nb_rows / BATCH_SIZE))
+
+    start = time.perf_counter()
+    dataset = make_csv_dataset(paths, batch_size=BATCH_SIZE, seed=0, cache=cache)
+
+    model = KerasMLPModel({"epochs": EPOCHS, "batch_size": BATCH_SIZE})
+    model.train_from_dataset(dataset)
+    return time.perf_counter() - start, steps
+
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    cfg = parse_config(load_yaml("configs/data.yaml"))
+    paths = [path for path in get_split_paths(cfg, "train") if path.exists()]
+    if not paths:
+        paths = [Path(tmp_dir) / "synthetic.csv"]
+        make_synthetic_csv(paths[0])
+
+    runs = [
+        ("naive in-memory", naive),
+        ("tf.data streaming", streaming),
+        ("tf.data + cache", lambda p: streaming(p, cache=True)),
+    ]
+    for name, run in runs:
+        elapsed, steps = run(paths)
+        print(f"{name:18s} {elapsed:7.2f} s  {steps / elapsed:8.1f} steps/s")
@@ -0,0 +1,49 @@
+"""
+Per-request overhead of the drift monitor, on synthetic hourly inputs.
+Run from the repository root: python -m helper_scripts.benchmark_drift_monitor
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.drift import DriftMonitor
+
+
+def make_batch(rng: np.random.Generator, nb_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "temp"      : rng.random(nb_rows),
+        "atemp"     : rng.random(nb_rows),
+        "hum"       : rng.random(nb_rows),
+        "windspeed" : rng.random(nb_rows) * 0.6,
+        "weathersit": rng.integers(1, 5, nb_rows),
+        "season"    : rng.integers(1, 5, nb_rows),
+    })
+
+
+def benchmark(monitor: DriftMonitor, batch: pd.DataFrame, predictions: np.ndarray, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        monitor.update(batch, predictions=predictions)
+    return (time.perf_counter() - start) / repeats
+
+
+rng = np.random.default_rng(0)
+monitor = DriftMonitor()
+reference = DriftMonitor()
+reference.update(make_batch(rng, 17379), predictions=rng.integers(0, 977, 17379))
+
+for nb_rows in [1, 32, 1024]:
+    batch = make_batch(rng, nb_rows)
+    predictions = rng.random(nb_rows) * 977
+    per_update = benchmark(monitor, batch, predictions, repeats=2000)
+    print(f"batch={nb_rows:5d}  {per_update * 1e6:8.1f} us/update  {per_update / nb_rows * 1e6:8.2f} us/row")
+
+# Single row passed as a plain dict (no dataframe construction on the serving side)
+row = {column: values[0] for column, values in make_batch(rng, 1).items()}
+per_update = benchmark(monitor, row, np.array([100.0]), repeats=2000)
+print(f"dict row     {per_update * 1e6:8.1f} us/update")
+
+start = time.perf_counter()
+scores = monitor.drift_scores(reference)
+print(f"drift_scores {(time.perf_counter() - start) * 1e3:8.2f} ms")
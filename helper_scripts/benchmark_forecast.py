@@ -0,0 +1,42 @@
+"""
+Time to build and score a 14 days x 24 hours x 100 stations forecast horizon, on a synthetic weather forecast.
+Run from the repository root: python -m helper_scripts.benchmark_forecast
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from src.inference.forecast import build_forecast_features, forecast
+
+NB_DAYS = 14
+NB_STATIONS = 100
+
+feature_columns = [
+    "instant", "yr", "holiday", "workingday", "temp", "atemp", "hum", "windspeed",
+    "very_good_weather", "good_weather", "bad_weather", "very_bad_weather", "spring", "summer", "fall", "winter",
+    "hr_sin", "hr_cos", "weekday_sin", "weekday_cos", "mnth_sin", "mnth_cos",
+]
+
+rng = np.random.default_rng(0)
+dates = pd.date_range("2013-01-01", periods=NB_DAYS, freq="D")
+index = pd.MultiIndex.from_product([range(NB_STATIONS), dates, range(24)], names=["station", "dteday", "hr"])
+weather = index.to_frame(index=False)
+for column in ["temp", "atemp", "hum", "windspeed"]:
+    weather[column] = rng.random(len(weather))
+weather["weathersit"] = rng.integers(1, 5, len(weather))
+
+model = LinearRegression().fit(rng.random((1000, len(feature_columns))), rng.random(1000) * 977)
+
+start = time.perf_counter()
+grid, x = build_forecast_features(weather, dates[0], NB_DAYS, feature_columns)
+build_time = time.perf_counter() - start
+
+start = time.perf_counter()
+predictions = forecast({"linear": model}, weather, dates[0], NB_DAYS, feature_columns)
+total_time = time.perf_counter() - start
+
+print(f"rows: {len(grid)}")
+print(f"build features   {build_time * 1e3:8.1f} ms")
+print(f"build + predict  {total_time * 1e3:8.1f} ms")
@@ -0,0 +1,331 @@
+"""
+Hourly forecasts over the next N days for every station.
+
+The future (station, dteday, hr) grid is generated from scratch and joined with the weather forecast inputs.
+Calendar features are computed once per hour of day and once per day of the horizon (with the same encoders as
+the feature extraction), then broadcast to the grid by indexing. The whole horizon is scored in a single
+vectorized predict call per model. Models can optionally be put behind the prediction cache, and the inputs and
+predictions can feed drift monitors.
+"""
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+from src.constants import data_config_yaml, models_config_yaml
+from src.inference.prediction_cache import CachedModel
+from src.models.models_utils import load_best_model
+from src.monitoring.drift import DriftMonitor
+from src.preprocessing.extract_constants import (
+    target_column, weather_categories, season_categories, hourly_cyclic_periods, cyclic_offsets,
+)
+from src.preprocessing.extract_features import cyclic_encode
+from src.utils.configs.data_config import DataConfig, parse_config
+from src.utils.configs.model_config import parse_models_yaml
+from src.utils.partitions import get_partition_configs
+from src.utils.utils import load_yaml, read_csv_header, save_yaml
+
+# First day of the dataset: yr is 0 for 2011, instant counts the hours from this day
+dataset_start_date = pd.Timestamp("2011-01-01")
+
+# Season start days (month, day), as labelled in the dataset
+season_start_days = [((3, 21), 2), ((6, 21), 3), ((9, 23), 4), ((12, 21), 1)]
+
+weather_columns = ["temp", "atemp", "hum", "windspeed"]
+
+
+# --------- Lookup tables ---------
+def cyclic_lookup(column: str) -> pd.DataFrame:
+    """
+    Cyclic encoding of every possible value of a column, indexed by the value.
+    """
+    period = hourly_cyclic_periods[column]
+    values = pd.DataFrame({column: np.arange(period + cyclic_offsets.get(column, 0))})
+    return cyclic_encode(values, periods={column: period}, offsets=cyclic_offsets).set_index(values[column])
+
+
+def one_hot_lookup(categories: Dict[int, str]) -> pd.DataFrame:
+    """
+    One-hot encoding of every category code, indexed by the code.
+    """
+    codes = sorted(categories)
+    return pd.DataFrame(np.eye(len(codes)), index=codes, columns=[categories[code] for code in codes])
+
+
+def get_season(dates: pd.DatetimeIndex) -> np.ndarray:
+    month_day = dates.month * 100 + dates.day
+    season = np.ones(len(dates), dtype=int)
+    for (month, day), code in season_start_days:
+        season[month_day >= month * 100 + day] = code
+    return season
+
+
+def day_features(dates: pd.DatetimeIndex, holidays: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+    """
+    Calendar features of every day of the horizon (one row per day, not per hour).
+
+    Args:
+        dates: The days of the horizon.
+        holidays: Optional holidays, defaults to the US federal holidays.
+
+    Returns:
+        Dataframe indexed like dates.
+    """
+    if holidays is None:
+        holidays = USFederalHolidayCalendar().holidays(dates.min(), dates.max())
+
+    weekday = (dates.dayofweek + 1) % 7  # 0 is sunday in this dataset
+    holiday = dates.isin(holidays).astype(int)
+
+    features = pd.DataFrame({
+        "yr"        : dates.year - dataset_start_date.year,
+        "holiday"   : holiday,
+        "workingday": ((weekday >= 1) & (weekday <= 5) & (holiday == 0)).astype(int),
+        "instant"   : (dates - dataset_start_date).days * 24 + 1,
+    })
+
+    lookups = [
+        cyclic_lookup("weekday").loc[weekday],
+        cyclic_lookup("mnth").loc[dates.month],
+        one_hot_lookup(season_categories).loc[get_season(dates)],
+    ]
+    return pd.concat([features] + [lookup.reset_index(drop=True) for lookup in lookups], axis=1)
+
+
+# --------- Grid ---------
+def build_forecast_features(
+    weather: pd.DataFrame,
+    start: str | pd.Timestamp,
+    nb_days: int,
+    feature_columns: list[str],
+    stations: Optional[list[Any]] = None,
+    holidays: Optional[pd.DatetimeIndex] = None,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Generate the (station, dteday, hr) grid of the horizon and its model inputs.
+
+    Args:
+        weather: Weather forecast with columns dteday, hr, temp, atemp, hum, windspeed, weathersit
+            (and station for several stations). Rows outside the horizon are ignored, duplicated rows are rejected.
+        start: First day of the horizon.
+        nb_days: Number of days of the horizon.
+        feature_columns: The model inputs, in the training order.
+        stations: The stations to forecast, defaults to the stations of the weather forecast.
+        holidays: Optional holidays, defaults to the US federal holidays.
+
+    Returns:
+        grid: The (station, dteday, hr) of every row.
+        x: The model inputs [nb_rows, nb_features].
+    """
+    dates = pd.date_range(pd.Timestamp(start).normalize(), periods=nb_days, freq="D")
+    has_station = "station" in weather
+    if not has_station and stations is not None:
+        raise ValueError("Stations given but the weather forecast has no station column")
+    if stations is None:
+        stations = sorted(weather["station"].unique()) if has_station else [None]
+    stations = list(stations)
+    nb_stations, nb_rows = len(stations), len(stations) * nb_days * 24
+
+    # Grid rows are ordered by (station, day, hour)
+    day_idx = np.tile(np.repeat(np.arange(nb_days), 24), nb_stations)
+    hr_idx = np.tile(np.arange(24), nb_stations * nb_days)
+
+    # Scatter the weather forecast on the grid
+    station_idx = (
+        pd.Index(stations).get_indexer(weather["station"]) if has_station else np.zeros(len(weather), dtype=int)
+    )
+    weather_day_idx = (pd.to_datetime(weather["dteday"]).dt.normalize() - dates[0]).dt.days.to_numpy()
+    weather_hr = weather["hr"].to_numpy(dtype=float)
+    invalid_hr = np.isnan(weather_hr) | (weather_hr != np.round(weather_hr))
+    if invalid_hr.any():
+        raise ValueError(f"Weather forecast has {int(invalid_hr.sum())} rows with a missing or non-integer hr")
+    weather_hr = weather_hr.astype(int)
+    in_horizon = (
+        (station_idx >= 0) & (weather_day_idx >= 0) & (weather_day_idx < nb_days) & (weather_hr >= 0) & (weather_hr < 24)
+    )
+    positions = (station_idx * nb_days + weather_day_idx) * 24 + weather_hr
+
+    nb_duplicates = int(in_horizon.sum()) - len(np.unique(positions[in_horizon]))
+    if nb_duplicates:
+        raise ValueError(f"Weather forecast has {nb_duplicates} duplicated (station, dteday, hr) rows")
+
+    row_features = {}
+    for column in weather_columns + ["weathersit"]:
+        values = np.full(nb_rows, np.nan)
+        values[positions[in_horizon]] = weather[column].to_numpy(dtype=float)[in_horizon]
+        row_features[column] = values
+
+    nb_missing = int(np.isnan(np.column_stack(list(row_features.values()))).any(axis=1).sum())
+    if nb_missing:
+        raise ValueError(f"Missing weather forecast for {nb_missing} of {nb_rows} (station, dteday, hr) rows")
+
+    weather_lookup = one_hot_lookup(weather_categories)
+    weather_codes = weather_lookup.index.get_indexer(row_features.pop("weathersit").astype(int))
+    if (weather_codes < 0).any():
+        raise ValueError(f"Unknown weathersit codes, expected one of {list(weather_lookup.index)}")
+    weather_one_hot = weather_lookup.to_numpy()[weather_codes]
+    row_features.update(dict(zip(weather_lookup.columns, weather_one_hot.T)))
+
+    day_table = day_features(dates, holidays)
+    hour_table = cyclic_lookup("hr")
+
+    x = np.empty((nb_rows, len(feature_columns)))
+    for j, column in enumerate(feature_columns):
+        if column in row_features:
+            x[:, j] = row_features[column]
+        elif column in hour_table:
+            x[:, j] = hour_table[column].to_numpy()[hr_idx]
+        elif column == "instant":
+            x[:, j] = day_table["instant"].to_numpy()[day_idx] + hr_idx
+        elif column in day_table:
+            x[:, j] = day_table[column].to_numpy()[day_idx]
+        else:
+            raise KeyError(f"Column {column} cannot be generated for the forecast horizon")
+
+    grid = pd.DataFrame({"dteday": dates[day_idx], "hr": hr_idx})
+    if has_station:
+        grid.insert(0, "station", np.repeat(np.asarray(stations, dtype=object), nb_days * 24))
+
+    return grid, x
+
+
+def forecast(
+    models: Dict[str, Any],
+    weather: pd.DataFrame,
+    start: str | pd.Timestamp,
+    nb_days: int,
+    feature_columns: list[str],
+    stations: Optional[list[Any]] = None,
+    holidays: Optional[pd.DatetimeIndex] = None,
+    monitors: Optional[Dict[str, DriftMonitor]] = None,
+) -> pd.DataFrame:
+    """
+    Forecast the horizon with every model, one predict call per model.
+
+    Args:
+        models: Mapping model name -> trained model (anything with a predict method, e.g. a CachedModel).
+        monitors: Optional mapping model name -> drift monitor, updated with the inputs and the model predictions.
+        See build_forecast_features for the other arguments.
+
+    Returns:
+        The grid with one prediction column per model.
+    """
+    grid, x = build_forecast_features(weather, start, nb_days, feature_columns, stations, holidays)
+    inputs = dict(zip(feature_columns, x.T)) if monitors else None
+
+    for name, model in models.items():
+        predictions = np.asarray(model.predict(x)).reshape(-1)
+        grid[name] = predictions
+        if monitors and name in monitors:
+            monitors[name].update(inputs, predictions=predictions)
+
+    return grid
+
+
+# --------- Main pipeline ---------
+def get_feature_columns(cfg: DataConfig) -> list[str]:
+    """
+    Get the model inputs from the processed hourly data header (shared by every partition).
+    """
+    partition_cfgs = get_partition_configs(cfg, "processed_path")
+    if not partition_cfgs:
+        raise FileNotFoundError(f"No processed partition found under {cfg.processed_path}")
+
+    header = read_csv_header(partition_cfgs[0].processed_hourly_data_path)
+    mismatching_paths = [
+        str(p.processed_hourly_data_path) for p in partition_cfgs[1:] if read_csv_header(p.processed_hourly_data_path) != header
+    ]
+    if mismatching_paths:
+        raise ValueError(f"Files with a different header than {partition_cfgs[0].processed_hourly_data_path}: {mismatching_paths}")
+
+    return [column for column in header if column != target_column]
+
+
+def load_drift_reference(cfg: DataConfig) -> DriftMonitor:
+    """
+    Merge the drift references of every partition (train splits).
+    """
+    partition_cfgs = get_partition_configs(cfg, "splitted_path")
+    if not partition_cfgs:
+        raise FileNotFoundError(f"No split partition found under {cfg.splitted_path}")
+
+    reference = DriftMonitor.load(partition_cfgs[0].drift_reference_path)
+    for partition_cfg in partition_cfgs[1:]:
+        reference.merge(DriftMonitor.load(partition_cfg.drift_reference_path))
+    return reference
+
+
+def main(args: argparse.Namespace) -> None:
+    cfg = parse_config(load_yaml(args.config_path))
+    feature_columns = get_feature_columns(cfg)
+
+    models_cfg = parse_models_yaml(load_yaml(args.models_config_path))
+    trained_models = [name for name, model_cfg in models_cfg.items() if str(model_cfg.best.path) not in ("", ".")]
+    if args.models:
+        # Explicitly requested models must exist and be trained, untrained ones are only skipped by default
+        unknown_models = [name for name in args.models if name not in models_cfg]
+        if unknown_models:
+            raise KeyError(f"Models {unknown_models} not found in {args.models_config_path}")
+        untrained_models = [name for name in args.models if name not in trained_models]
+        if untrained_models:
+            raise ValueError(f"Models {untrained_models} have no trained best model in {args.models_config_path}")
+        model_names = args.models
+    else:
+        model_names = trained_models
+    if not model_names:
+        raise ValueError("No trained model found in the models configuration")
+
+    models = {name: load_best_model(models_cfg[name]) for name in model_names}
+
+    if args.cache:
+        models = {
+            name: CachedModel(model, model_name=name, models_yaml_path=args.models_config_path)
+            for name, model in models.items()
+        }
+
+    # Drift monitors are kept across runs, one per model, with the bins of the train reference
+    monitors = None
+    if args.drift_dir:
+        drift_dir = Path(args.drift_dir)
+        reference = load_drift_reference(cfg)
+        monitors = {
+            name: (
+                DriftMonitor.load(drift_dir / f"{name}.joblib") if (drift_dir / f"{name}.joblib").exists()
+                else DriftMonitor.empty_like(reference)
+            )
+            for name in models
+        }
+
+    weather = pd.read_csv(args.weather_csv)
+    predictions = forecast(models, weather, args.start, args.days, feature_columns, monitors=monitors)
+
+    Path(args.output_csv).parent.mkdir(parents=True, exist_ok=True)
+    predictions.to_csv(args.output_csv, index=False)
+
+    if monitors:
+        for name, monitor in monitors.items():
+            monitor.save(drift_dir / f"{name}.joblib")
+            save_yaml(monitor.drift_scores(reference), drift_dir / f"{name}_drift_scores.yaml")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Forecast")
+    parser.add_argument("--weather_csv", type=str, required=True,
+                        help="Weather forecast csv (dteday, hr, temp, atemp, hum, windspeed, weathersit, [station])"
+                        )
+    parser.add_argument("--start", type=str, required=True, help="First day of the horizon (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=14, help="Number of days of the horizon")
+    parser.add_argument("--models", nargs="*", default=None, help="Models to use, defaults to every trained model")
+    parser.add_argument("--output_csv", type=str, default="data/forecasts/forecast.csv", help="Path to the output csv")
+    parser.add_argument("--cache", action="store_true", help="Put the models behind the prediction cache")
+    parser.add_argument("--drift_dir", type=str, default=None,
+                        help="Directory of the drift monitors, updated with the forecast inputs and predictions"
+                        )
+    parser.add_argument("--config_path", type=str, default=data_config_yaml, help="Path to the data config yaml file")
+    parser.add_argument("--models_config_path", type=str, default=models_config_yaml, help="Path to the models config yaml file")
+    arguments = parser.parse_args()
+
+    main(arguments)
@@ -0,0 +1,185 @@
+"""
+Bounded LRU/TTL prediction cache in front of TemplateModel.predict.
+Most hourly inputs are low-cardinality (hr, weekday, mnth, season, weathersit, holiday, workingday) and the
+weather inputs come from forecasts with a limited precision, so serving traffic repeats the same feature rows.
+Rows are quantized before hashing so that forecasts differing only by noise share the same entry.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.constants import models_config_yaml
+from src.models.model_template import TemplateModel
+from src.models.models_utils import get_model_yaml
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    batches: int = 0
+    total_time: float = 0.0
+    model_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mean_batch_latency(self) -> float:
+        return self.total_time / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits"              : self.hits,
+            "misses"            : self.misses,
+            "hit_rate"          : self.hit_rate,
+            "evictions"         : self.evictions,
+            "expirations"       : self.expirations,
+            "invalidations"     : self.invalidations,
+            "batches"           : self.batches,
+            "mean_batch_latency": self.mean_batch_latency,
+            "model_time"        : self.model_time,
+        }
+
+
+class CachedModel:
+    """
+    Wrap a trained model with a bounded prediction cache.
+
+    Only the rows missing from the cache (deduplicated) are sent to the model, in a single predict call.
+    When model_name is given, the registry (models.yaml) is polled every registry_check_interval seconds:
+    if the best model changed, it is reloaded and the cache is cleared.
+    """
+
+    def __init__(
+        self,
+        model: TemplateModel,
+        max_size: int = 100_000,
+        ttl: Optional[float] = None,
+        decimals: int = 3,
+        model_name: Optional[str] = None,
+        models_yaml_path: str | Path = models_config_yaml,
+        registry_check_interval: float = 5.0,
+    ):
+        """
+        Args:
+            model: The trained model.
+            max_size: Maximum number of cached rows, the least recently used are evicted first.
+            ttl: Optional time to live of an entry, in seconds.
+            decimals: Number of decimals kept when quantizing the features.
+            model_name: Optional model name in the registry, used to invalidate the cache.
+            models_yaml_path: Path to the models registry.
+            registry_check_interval: Minimum delay between two registry checks, in seconds.
+        """
+        if max_size <= 0:
+            raise ValueError(f"max_size should be positive, got: {max_size}")
+
+        self.model = model
+        self.max_size = max_size
+        self.ttl = ttl
+        self.decimals = decimals
+        self.model_name = model_name
+        self.models_yaml_path = models_yaml_path
+        self.registry_check_interval = registry_check_interval
+
+        self.metrics = CacheMetrics()
+        self._cache: OrderedDict[bytes, tuple[float, float]] = OrderedDict()
+        self._registry_version = self._read_registry_version()
+        self._last_registry_check = time.monotonic()
+
+    # --------- Registry ---------
+    def _read_registry_version(self) -> Optional[tuple[str, str]]:
+        if self.model_name is None:
+            return None
+        best = get_model_yaml(self.model_name, self.models_yaml_path).get("best", {})
+        return best.get("path", ""), best.get("trained_at", "")
+
+    def _check_registry(self, now: float) -> None:
+        if self.model_name is None or now - self._last_registry_check < self.registry_check_interval:
+            return
+        self._last_registry_check = now
+
+        version = self._read_registry_version()
+        if version == self._registry_version:
+            return
+
+        # The model resolves its own path (e.g. suffix), a failed reload is retried on the next check
+        best_path, _ = version
+        if best_path:
+            self.model.load_model(best_path)
+        self._registry_version = version
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+        self.metrics.invalidations += 1
+
+    # --------- Prediction ---------
+    def _row_keys(self, x: np.ndarray) -> list[bytes]:
+        # -0.0 and 0.0 must share the same key
+        x_quantized = np.ascontiguousarray(np.round(x, self.decimals) + 0.0)
+        return [row.tobytes() for row in x_quantized]
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        start = time.perf_counter()
+        now = time.monotonic()
+        self._check_registry(now)
+
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        keys = self._row_keys(x)
+        preds = np.empty(len(keys), dtype=float)
+
+        # Rows to send to the model, deduplicated: key -> indices in the batch
+        misses: dict[bytes, list[int]] = {}
+        for i, key in enumerate(keys):
+            entry = self._cache.get(key)
+            if entry is not None and self.ttl is not None and entry[1] < now:
+                del self._cache[key]
+                self.metrics.expirations += 1
+                entry = None
+
+            if entry is None:
+                misses.setdefault(key, []).append(i)
+                continue
+
+            self._cache.move_to_end(key)
+            preds[i] = entry[0]
+            self.metrics.hits += 1
+
+        if misses:
+            first_indices = [indices[0] for indices in misses.values()]
+            model_start = time.perf_counter()
+            # Some models return [n, 1] predictions
+            miss_preds = np.asarray(self.model.predict(np.round(x[first_indices], self.decimals)), dtype=float).reshape(-1)
+            self.metrics.model_time += time.perf_counter() - model_start
+
+            if len(miss_preds) != len(first_indices):
+                raise ValueError(
+                    f"Expected one prediction per row, got {len(miss_preds)} predictions for {len(first_indices)} rows"
+                )
+
+            expires_at = now + self.ttl if self.ttl is not None else float("inf")
+            for (key, indices), pred in zip(misses.items(), miss_preds):
+                preds[indices] = pred
+                self.metrics.misses += len(indices)
+                self._cache[key] = (float(pred), expires_at)
+
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.metrics.evictions += 1
+
+        self.metrics.batches += 1
+        self.metrics.total_time += time.perf_counter() - start
+        return preds
+
+    def __len__(self) -> int:
+        return len(self._cache)
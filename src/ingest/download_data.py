@@ -8,6 +8,7 @@ from pathlib import Path
 import requests
 
 from src.utils.configs.data_config import DataConfig, parse_config
+from src.utils.partitions import get_partition_configs
 from src.utils.utils import load_yaml, check_paths_exist
 
 
@@ -66,8 +67,9 @@ def main(config_path: str = "configs/data.yaml") -> None:
     ensure_downloaded(cfg)
     ensure_extracted(cfg)
 
-    # Sanity check
-    check_paths_exist([cfg.raw_hourly_data_path, cfg.raw_daily_data_path])
+    # Sanity check (every partition when the layout is partitioned)
+    partition_cfgs = get_partition_configs(cfg, stage="extracted_path")
+    check_paths_exist([path for p in partition_cfgs for path in (p.raw_hourly_data_path, p.raw_daily_data_path)])
 
 
 if __name__ == '__main__':
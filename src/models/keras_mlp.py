@@ -0,0 +1,109 @@
+"""
+Neural model for bicycle rent prediction. Here a Keras multilayer perceptron regressor is used.
+It can be trained from in-memory arrays or from a streaming tf.data dataset (see src/training/data_loader.py).
+"""
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+import numpy as np
+import tensorflow as tf
+
+from src.models.model_template import TemplateModel
+
+
+default_parameters = {
+    "hidden_units" : [64, 32],
+    "activation"   : "relu",
+    "dropout"      : 0.0,
+    "learning_rate": 1e-3,
+    "loss"         : "mse",
+    "epochs"       : 20,
+    "batch_size"   : 256,
+}
+
+
+class KerasMLPModel(TemplateModel):
+
+    def __init__(self, parameters=None):
+        self.parameters = {**default_parameters, **(parameters or {})}
+        super().__init__(parameters=self.parameters)
+
+    @staticmethod
+    def get_model(parameters: Optional[Dict[str, Any]] = None) -> tf.keras.Model:
+        """
+        Build and return a compiled Keras MLP regressor.
+        The input size is inferred on the first batch.
+        """
+        params = {**default_parameters, **(parameters or {})}
+
+        layers = [tf.keras.layers.Normalization(axis=-1)]
+        for units in params["hidden_units"]:
+            layers.append(tf.keras.layers.Dense(units, activation=params["activation"]))
+            if params["dropout"]:
+                layers.append(tf.keras.layers.Dropout(params["dropout"]))
+        layers.append(tf.keras.layers.Dense(1))
+
+        model = tf.keras.Sequential(layers)
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=params["learning_rate"]),
+            loss=params["loss"],
+        )
+        return model
+
+    def _adapt_normalization(self, x: np.ndarray | tf.data.Dataset, nb_batches: Optional[int] = None) -> None:
+        normalization = self.model.layers[0]
+        if isinstance(x, tf.data.Dataset):
+            x = x.map(lambda features, _: features)
+            if nb_batches:
+                x = x.take(nb_batches)
+        normalization.adapt(x)
+
+    def train_regressor(self, x_train: np.ndarray, y_train: np.ndarray) -> None:
+        self._adapt_normalization(x_train)
+        self.model.fit(
+            x_train,
+            y_train,
+            epochs=self.parameters["epochs"],
+            batch_size=self.parameters["batch_size"],
+            verbose=0,
+        )
+
+    def train_from_dataset(
+        self,
+        dataset: tf.data.Dataset,
+        validation_data: Optional[tf.data.Dataset] = None,
+        steps_per_epoch: Optional[int] = None,
+        adapt_batches: Optional[int] = 100,
+    ) -> tf.keras.callbacks.History:
+        """
+        Train the regressor from a streaming dataset of (features, label) batches.
+
+        Args:
+            dataset: The training dataset.
+            validation_data: Optional validation dataset.
+            steps_per_epoch: Required if the dataset repeats indefinitely.
+            adapt_batches: Number of batches used to fit the input normalization (None for the whole dataset).
+
+        Returns:
+            The Keras training history.
+        """
+        self._adapt_normalization(dataset, nb_batches=adapt_batches)
+        return self.model.fit(
+            dataset,
+            validation_data=validation_data,
+            epochs=self.parameters["epochs"],
+            steps_per_epoch=steps_per_epoch,
+            verbose=0,
+        )
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return self.model.predict(x, batch_size=self.parameters["batch_size"], verbose=0).reshape(-1)
+
+    def save_model(self, path: str | Path) -> None:
+        # Keras picks the format from the suffix
+        path = Path(path).with_suffix(".keras")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.model.save(path)
+
+    def load_model(self, path: str | Path) -> None:
+        self.model = tf.keras.models.load_model(Path(path).with_suffix(".keras"))
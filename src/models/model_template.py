@@ -97,3 +97,17 @@ class TemplateSKLModel(TemplateModel, ABC):
 
     def load_model(self, path: str | Path) -> None:
         self.model = joblib.load(path)
+
+
+class EstimatorModel(TemplateSKLModel):
+    """
+    Template for any scikit-learn compatible estimator class (e.g. the class_path of a models.yaml entry).
+    """
+
+    def __init__(self, estimator_class, parameters=None):
+        self.estimator_class = estimator_class
+        super().__init__(parameters=parameters)
+
+    def get_model(self, parameters: Optional[Dict[str, Any]] = None) -> Any:
+        params = dict(parameters) if parameters else {}
+        return self.estimator_class(**params)
@@ -1,7 +1,10 @@
+import importlib
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.models.model_template import EstimatorModel, TemplateModel
+from src.utils.configs.model_config import ModelConfig
 from src.utils.utils import load_yaml, save_yaml
 
 
@@ -83,3 +86,29 @@ def update_model_yaml(
 
     save_yaml(models_yaml, yaml_path)
     return models_yaml
+
+
+def import_class(class_path: str) -> type:
+    """
+    Import a class from its dotted path (e.g. "sklearn.svm.SVR").
+    """
+    module_path, _, class_name = class_path.rpartition(".")
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def load_best_model(model_cfg: ModelConfig) -> TemplateModel:
+    """
+    Build a model from its registry class and load its best trained version.
+    class_path is either a TemplateModel subclass or a scikit-learn compatible estimator class.
+    """
+    if str(model_cfg.best.path) in ("", "."):
+        raise ValueError(f"Model '{model_cfg.model_type}' has no trained best model")
+
+    model_class = import_class(model_cfg.class_path)
+    if isinstance(model_class, type) and issubclass(model_class, TemplateModel):
+        model = model_class(parameters=model_cfg.best.parameters)
+    else:
+        model = EstimatorModel(model_class, parameters=model_cfg.best.parameters)
+
+    model.load_model(model_cfg.best.path)
+    return model
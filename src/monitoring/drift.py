@@ -0,0 +1,292 @@
+"""
+Low-overhead drift monitoring of the hourly model inputs and predictions.
+Every feature is summarised by a fixed-size streaming sketch (counts against fixed bin edges or categories),
+so the memory used does not grow with the traffic and sketches from several processes can be merged.
+Drift scores (PSI, KS) are computed on demand against the reference sketches built from the training split.
+"""
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import joblib
+import numpy as np
+
+from src.preprocessing.extract_constants import weather_categories, season_categories
+
+
+# Bins as (start, stop, nb_bins), values outside [start, stop] fall in the under/overflow bins
+numeric_features_bins = {
+    "temp"     : (0.0, 1.0, 20),
+    "atemp"    : (0.0, 1.0, 20),
+    "hum"      : (0.0, 1.0, 20),
+    "windspeed": (0.0, 1.0, 20),
+}
+
+categorical_features_categories = {
+    "weathersit": weather_categories,
+    "season"    : season_categories,
+}
+
+# Fallback only: the reference bins of the predictions come from the train split (see get_predictions_bins)
+prediction_bins = (0.0, 1000.0, 20)
+
+# Avoid log(0) and divisions by 0 for empty bins
+_EPS = 1e-6
+
+
+def _proportions(counts: np.ndarray) -> np.ndarray:
+    total = counts.sum()
+    if total == 0:
+        return np.zeros(len(counts))
+    return counts / total
+
+
+def get_predictions_bins(max_value: float, nb_bins: int = 20) -> tuple[float, float, int]:
+    """
+    Bins of the predictions sketch, covering [0, max_value] (e.g. the max of the target over the train splits).
+    """
+    return 0.0, float(max_value) if max_value > 0 else 1.0, nb_bins
+
+
+def population_stability_index(ref_counts: np.ndarray, cur_counts: np.ndarray) -> float:
+    """
+    Population Stability Index between two count vectors over the same bins.
+    Rule of thumb: < 0.1 no drift, 0.1 - 0.25 moderate drift, > 0.25 significant drift.
+    NaN if one of the sketches is empty.
+    """
+    if not ref_counts.sum() or not cur_counts.sum():
+        return float("nan")
+    ref = np.clip(_proportions(ref_counts), _EPS, None)
+    cur = np.clip(_proportions(cur_counts), _EPS, None)
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def total_variation_distance(ref_counts: np.ndarray, cur_counts: np.ndarray) -> float:
+    """
+    Total variation distance between two count vectors over the same categories, the categorical counterpart of KS.
+    NaN if one of the sketches is empty.
+    """
+    if not ref_counts.sum() or not cur_counts.sum():
+        return float("nan")
+    return float(0.5 * np.abs(_proportions(ref_counts) - _proportions(cur_counts)).sum())
+
+
+def kolmogorov_smirnov(ref_counts: np.ndarray, cur_counts: np.ndarray) -> float:
+    """
+    Kolmogorov-Smirnov statistic (max distance between the CDFs) evaluated at the bin edges.
+    It is a lower bound of the exact statistic, as the position of the values within a bin is lost.
+    NaN if one of the sketches is empty.
+    """
+    if not ref_counts.sum() or not cur_counts.sum():
+        return float("nan")
+    ref_cdf = np.cumsum(_proportions(ref_counts))
+    cur_cdf = np.cumsum(_proportions(cur_counts))
+    return float(np.max(np.abs(ref_cdf - cur_cdf)))
+
+
+class HistogramSketch:
+    """
+    Fixed-size sketch of a numeric feature: counts against fixed bin edges, plus under/overflow and missing counts.
+    """
+
+    def __init__(self, start: float, stop: float, nb_bins: int):
+        self.edges = np.linspace(start, stop, nb_bins + 1)
+        # counts[0] is the underflow and counts[-1] the overflow
+        self.counts = np.zeros(nb_bins + 2, dtype=np.int64)
+        self.missing = 0
+
+    def update(self, values: Any) -> None:
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        nan_mask = np.isnan(values)
+        self.missing += int(nan_mask.sum())
+
+        idx = np.searchsorted(self.edges, values[~nan_mask], side="right")
+        # The stop value belongs to the last bin, not to the overflow
+        idx[values[~nan_mask] == self.edges[-1]] = len(self.edges) - 1
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+
+    def merge(self, other: "HistogramSketch") -> None:
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histogram sketches with different bin edges")
+        self.counts += other.counts
+        self.missing += other.missing
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate quantile, linearly interpolated within the bin.
+        """
+        total = self.counts.sum()
+        if total == 0:
+            return float("nan")
+
+        cum_counts = np.cumsum(self.counts)
+        bin_idx = int(np.searchsorted(cum_counts, q * total, side="left"))
+
+        # Under/overflow: only the bound is known
+        if bin_idx == 0:
+            return float(self.edges[0])
+        if bin_idx == len(self.counts) - 1:
+            return float(self.edges[-1])
+
+        previous = cum_counts[bin_idx - 1]
+        fraction = (q * total - previous) / self.counts[bin_idx]
+        low, high = self.edges[bin_idx - 1], self.edges[bin_idx]
+        return float(low + fraction * (high - low))
+
+    def drift(self, reference: "HistogramSketch") -> Dict[str, float]:
+        return {
+            "psi": population_stability_index(reference.counts, self.counts),
+            "ks" : kolmogorov_smirnov(reference.counts, self.counts),
+        }
+
+
+class CategorySketch:
+    """
+    Fixed-size sketch of a categorical feature: one count per known category, plus an "other" count.
+    """
+
+    def __init__(self, categories: Dict[int, str]):
+        self.categories = dict(categories)
+        self._codes = np.array(sorted(self.categories))
+        # counts[-1] counts the unknown categories
+        self.counts = np.zeros(len(self._codes) + 1, dtype=np.int64)
+
+    def update(self, codes: Any) -> None:
+        codes = np.atleast_1d(np.asarray(codes))
+        idx = np.searchsorted(self._codes, codes)
+        idx[(idx == len(self._codes)) | (self._codes[np.minimum(idx, len(self._codes) - 1)] != codes)] = len(self._codes)
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+
+    def update_one_hot(self, one_hot: np.ndarray) -> None:
+        """
+        Update from one-hot encoded columns, ordered as the sorted category codes.
+        Rows without any active column (unknown category, ignored by the encoder) are counted as "other".
+        """
+        one_hot = np.atleast_2d(one_hot)
+        idx = np.argmax(one_hot, axis=1)
+        idx[one_hot.sum(axis=1) == 0] = len(self._codes)
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+
+    def merge(self, other: "CategorySketch") -> None:
+        if self.categories != other.categories:
+            raise ValueError("Cannot merge category sketches with different categories")
+        self.counts += other.counts
+
+    def proportions(self) -> Dict[str, float]:
+        proportions = _proportions(self.counts)
+        names = [self.categories[code] for code in self._codes] + ["other"]
+        return dict(zip(names, proportions.tolist()))
+
+    def drift(self, reference: "CategorySketch") -> Dict[str, float]:
+        return {
+            "psi": population_stability_index(reference.counts, self.counts),
+            "tvd": total_variation_distance(reference.counts, self.counts),
+        }
+
+
+class DriftMonitor:
+    """
+    Streaming sketches of the hourly inputs and predictions.
+
+    The reference monitor is built from the hourly train split when splitting the data (the target is used as
+    the reference of the predictions, binned up to its max). The serving / batch inference path creates its own
+    monitor with empty_like(reference), keeps it up to date with update() and calls drift_scores(reference) when needed.
+    """
+
+    def __init__(
+        self,
+        numeric_bins: Optional[Dict[str, tuple[float, float, int]]] = None,
+        categories: Optional[Dict[str, Dict[int, str]]] = None,
+        predictions_bins: Optional[tuple[float, float, int]] = None,
+    ):
+        numeric_bins = numeric_bins or numeric_features_bins
+        categories = categories or categorical_features_categories
+
+        self.numeric = {feature: HistogramSketch(*bins) for feature, bins in numeric_bins.items()}
+        self.categorical = {feature: CategorySketch(cats) for feature, cats in categories.items()}
+        self.predictions = HistogramSketch(*(predictions_bins or prediction_bins))
+
+    @staticmethod
+    def empty_like(reference: "DriftMonitor") -> "DriftMonitor":
+        """
+        Empty monitor with the same bins and categories as the reference, e.g. for the serving side.
+        """
+        def bins(sketch: HistogramSketch) -> tuple[float, float, int]:
+            return float(sketch.edges[0]), float(sketch.edges[-1]), len(sketch.edges) - 1
+
+        return DriftMonitor(
+            numeric_bins={feature: bins(sketch) for feature, sketch in reference.numeric.items()},
+            categories={feature: sketch.categories for feature, sketch in reference.categorical.items()},
+            predictions_bins=bins(reference.predictions),
+        )
+
+    def update(self, data: Mapping[str, Any], predictions: Any = None) -> None:
+        """
+        Update the sketches with a batch (or a single row) of inputs.
+
+        Args:
+            data: Dataframe or mapping column -> values. Categorical features are read from their raw code
+                column (e.g. "weathersit") or, for processed data, from their one-hot encoded columns.
+            predictions: Optional predictions for the same rows.
+        """
+        for feature, sketch in self.numeric.items():
+            if feature in data:
+                sketch.update(data[feature])
+
+        for feature, sketch in self.categorical.items():
+            if feature in data:
+                sketch.update(data[feature])
+                continue
+
+            # A one-hot column is missing when its category never occurred in the encoded data
+            one_hot_columns = [sketch.categories[code] for code in sorted(sketch.categories)]
+            present_columns = [column for column in one_hot_columns if column in data]
+            if present_columns:
+                nb_rows = len(np.atleast_1d(data[present_columns[0]]))
+                sketch.update_one_hot(np.column_stack([
+                    np.atleast_1d(data[column]) if column in data else np.zeros(nb_rows) for column in one_hot_columns
+                ]))
+
+        if predictions is not None:
+            self.predictions.update(predictions)
+
+    def update_predictions(self, predictions: Any) -> None:
+        self.predictions.update(predictions)
+
+    def merge(self, other: "DriftMonitor") -> None:
+        for feature, sketch in self.numeric.items():
+            sketch.merge(other.numeric[feature])
+        for feature, sketch in self.categorical.items():
+            sketch.merge(other.categorical[feature])
+        self.predictions.merge(other.predictions)
+
+    def drift_scores(self, reference: "DriftMonitor") -> Dict[str, Dict[str, float]]:
+        """
+        Compute the drift scores of every sketch against the reference.
+
+        Returns:
+            Mapping feature -> scores ("psi" and "ks" for numeric features and predictions, "psi" and "tvd"
+            for categorical features). Features without any observation are skipped, the scores are NaN if the
+            reference has no observation (e.g. one-hot columns missing when it was built).
+        """
+        scores = {}
+        for feature, sketch in self.numeric.items():
+            if sketch.counts.sum():
+                scores[feature] = sketch.drift(reference.numeric[feature])
+
+        for feature, sketch in self.categorical.items():
+            if sketch.counts.sum():
+                scores[feature] = sketch.drift(reference.categorical[feature])
+
+        if self.predictions.counts.sum():
+            scores["predictions"] = self.predictions.drift(reference.predictions)
+
+        return scores
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str | Path) -> "DriftMonitor":
+        return joblib.load(path)
@@ -1,5 +1,7 @@
 columns_to_drop = ["dteday", "casual", "registered"]
 
+target_column = "cnt"
+
 weather_categories = {
     1: "very_good_weather",
     2: "good_weather",
@@ -15,6 +17,12 @@ season_categories = {
 }
 
 categorical_features = ["weathersit", "season"]
+categorical_categories = {"weathersit": weather_categories, "season": season_categories}
+
+# Cyclic encoding periods, mnth is 1..12 in this dataset
+hourly_cyclic_periods = {"hr": 24, "weekday": 7, "mnth": 12}
+daily_cyclic_periods = {"weekday": 7, "mnth": 12}
+cyclic_offsets = {"mnth": 1}
 
 column_names_map = {f"weathersit_{k}": v for k, v in weather_categories.items()}
 column_names_map.update({f"season_{k}": v for k, v in season_categories.items()})
\ No newline at end of file
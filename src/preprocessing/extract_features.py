@@ -1,30 +1,41 @@
 """
 
 """
+import argparse
 
 from sklearn.preprocessing import OneHotEncoder
 import pandas as pd
 import numpy as np
 
-from src.utils.configs.data_config import parse_config
+from src.utils.configs.data_config import DataConfig, parse_config
+from src.utils.partitions import PartitionFilters, parse_partition_filters, run_partitioned
 from src.utils.utils import load_yaml, check_paths_exist
 
-from src.preprocessing.extract_constants import columns_to_drop, categorical_features, column_names_map
+from src.preprocessing.extract_constants import (
+    columns_to_drop, categorical_features, categorical_categories, column_names_map,
+    hourly_cyclic_periods, daily_cyclic_periods, cyclic_offsets,
+)
 
 
-def one_hot_encode(df: pd.DataFrame, columns: list[str]) -> tuple[pd.DataFrame, OneHotEncoder]:
+def one_hot_encode(
+    df: pd.DataFrame,
+    columns: list[str],
+    categories: str | list[list[int]] = "auto",
+) -> tuple[pd.DataFrame, OneHotEncoder]:
     """
     One-hot encode the specified categorical columns.
 
     Args:
         df: Input dataframe.
         columns: The columns to encode.
+        categories: "auto" to use the categories found in df, or the categories of each column.
 
     Returns:
         df_out: The transformed dataframe
         encoder: The fitted encoder
     """
     encoder = OneHotEncoder(
+        categories=categories,
         sparse_output=False,
         handle_unknown="ignore"
     )
@@ -80,10 +91,10 @@ def cyclic_encode(df: pd.DataFrame, periods: dict[str, int], drop: bool = True,
 
 
 # --------- Main pipeline ---------
-def main(config_path: str = "configs/data.yaml") -> None:
-    cfg_dict = load_yaml(config_path)
-    cfg = parse_config(cfg_dict)
-
+def process_dataset(cfg: DataConfig) -> None:
+    """
+    Extract the features of a single dataset (or partition) and save the processed data.
+    """
     check_paths_exist([cfg.raw_hourly_data_path, cfg.raw_daily_data_path])
 
     daily_df = pd.read_csv(cfg.raw_daily_data_path)
@@ -94,19 +105,40 @@ def main(config_path: str = "configs/data.yaml") -> None:
     hourly_df.drop(columns_to_drop, axis=1, inplace=True)
 
     # One hot encode categorical preprocessing
-    daily_df_cat_encoded, _ = one_hot_encode(daily_df, categorical_features)
-    hourly_df_cat_encoded, _ = one_hot_encode(hourly_df, categorical_features)
+    # Partitions may miss some categories, use the fixed codes so that they all share the same columns
+    categories = [sorted(categorical_categories[f]) for f in categorical_features] if cfg.partition else "auto"
+    daily_df_cat_encoded, _ = one_hot_encode(daily_df, categorical_features, categories)
+    hourly_df_cat_encoded, _ = one_hot_encode(hourly_df, categorical_features, categories)
     for df in [daily_df_cat_encoded, hourly_df_cat_encoded]:
         df.rename(columns=column_names_map, inplace=True)
 
     # Cyclic encode periodic preprocessing
-    daily_df_processed = cyclic_encode(daily_df_cat_encoded, periods={"weekday": 7, "mnth": 12}, offsets={"mnth": 1})  # mnth is 1..12 in this dataset
-    hourly_df_processed = cyclic_encode(hourly_df_cat_encoded, periods={"hr": 24, "weekday": 7, "mnth": 12}, offsets={"mnth": 1})
+    daily_df_processed = cyclic_encode(daily_df_cat_encoded, periods=daily_cyclic_periods, offsets=cyclic_offsets)
+    hourly_df_processed = cyclic_encode(hourly_df_cat_encoded, periods=hourly_cyclic_periods, offsets=cyclic_offsets)
 
     # Save processed data
+    cfg.processed_path.mkdir(parents=True, exist_ok=True)
     daily_df_processed.to_csv(cfg.processed_daily_data_path, index=False)
     hourly_df_processed.to_csv(cfg.processed_hourly_data_path, index=False)
 
 
+def main(
+    config_path: str = "configs/data.yaml",
+    filters: PartitionFilters | None = None,
+    max_workers: int | None = None,
+) -> None:
+    cfg_dict = load_yaml(config_path)
+    cfg = parse_config(cfg_dict)
+
+    # Partitions (if any) are processed in parallel
+    run_partitioned(process_dataset, cfg, stage="extracted_path", filters=filters, max_workers=max_workers)
+
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser("Feature extraction parser")
+    parser.add_argument("--config_path", type=str, default="configs/data.yaml", help="Path to the data config yaml file")
+    parser.add_argument("--filter", action="append", dest="filters", help="Partition filter as key=value[,value...] (repeatable)")
+    parser.add_argument("--max_workers", type=int, default=None, help="Number of processes used for the partitions")
+    arguments = parser.parse_args()
+
+    main(arguments.config_path, filters=parse_partition_filters(arguments.filters), max_workers=arguments.max_workers)
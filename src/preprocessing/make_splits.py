@@ -1,17 +1,22 @@
 import argparse
 import pandas as pd
 
-from src.utils.configs.data_config import parse_config
+from functools import partial
+
+from src.monitoring.drift import DriftMonitor, get_predictions_bins
+from src.preprocessing.extract_constants import target_column
+from src.utils.configs.data_config import DataConfig, parse_config
+from src.utils.partitions import PartitionFilters, parse_partition_filters, run_partitioned
 from src.utils.utils import load_yaml, check_paths_exist
 
 
-# --------- Main pipeline ---------
-def main(splits=None, config_path: str = "configs/data.yaml") -> None:
-    splits = splits or [0.85, 0.15]
-
-    cfg_dict = load_yaml(config_path)
-    cfg = parse_config(cfg_dict)
+def split_dataset(cfg: DataConfig, splits: list[float]) -> float:
+    """
+    Split the processed data of a single dataset (or partition) into train and test files.
 
+    Returns:
+        The max of the hourly train target, used to bin the predictions for drift monitoring.
+    """
     check_paths_exist([cfg.processed_daily_data_path, cfg.processed_hourly_data_path])
 
     daily_df = pd.read_csv(cfg.processed_daily_data_path)
@@ -27,18 +32,60 @@ def main(splits=None, config_path: str = "configs/data.yaml") -> None:
     test_daily_df = daily_df[nb_train_records_daily:]
 
     # Save splitted data
+    cfg.splitted_path.mkdir(parents=True, exist_ok=True)
     train_hourly_df.to_csv(cfg.train_hourly_data_path, index=False)
     test_hourly_df.to_csv(cfg.test_hourly_data_path, index=False)
     train_daily_df.to_csv(cfg.train_daily_data_path, index=False)
     test_daily_df.to_csv(cfg.test_daily_data_path, index=False)
 
+    return float(train_hourly_df[target_column].max()) if len(train_hourly_df) else 0.0
+
+
+def build_drift_reference(cfg: DataConfig, predictions_bins: tuple[float, float, int]) -> None:
+    """
+    Build the drift monitoring reference of a single dataset (or partition) from its hourly train split only.
+    The target stands for the predictions.
+    """
+    train_hourly_df = pd.read_csv(cfg.train_hourly_data_path)
+
+    drift_reference = DriftMonitor(predictions_bins=predictions_bins)
+    drift_reference.update(train_hourly_df, predictions=train_hourly_df[target_column])
+    drift_reference.save(cfg.drift_reference_path)
+
+
+# --------- Main pipeline ---------
+def main(
+    splits=None,
+    config_path: str = "configs/data.yaml",
+    filters: PartitionFilters | None = None,
+    max_workers: int | None = None,
+) -> None:
+    splits = splits or [0.85, 0.15]
+
+    cfg_dict = load_yaml(config_path)
+    cfg = parse_config(cfg_dict)
+
+    # Partitions (if any) are processed in parallel
+    train_maxima = run_partitioned(
+        partial(split_dataset, splits=splits), cfg, stage="processed_path", filters=filters, max_workers=max_workers
+    )
+
+    # The predictions bins are shared by the partitions so that their references can be merged
+    predictions_bins = get_predictions_bins(max(train_maxima))
+    run_partitioned(
+        partial(build_drift_reference, predictions_bins=predictions_bins),
+        cfg, stage="splitted_path", filters=filters, max_workers=max_workers,
+    )
+
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser("Data splitting parser")
     parser.add_argument("--splits", nargs=2, type=float, default=[0.85, 0.15], help="How the data should be splitted (train, test) (should sum up to 1)")
+    parser.add_argument("--filter", action="append", dest="filters", help="Partition filter as key=value[,value...] (repeatable)")
+    parser.add_argument("--max_workers", type=int, default=None, help="Number of processes used for the partitions")
     arguments = parser.parse_args()
 
     if sum(arguments.splits) != 1:
         raise ValueError(f"The sum of all splits should equal to 1, got: {sum(arguments.splits)}")
 
-    main(arguments)
+    main(arguments.splits, filters=parse_partition_filters(arguments.filters), max_workers=arguments.max_workers)
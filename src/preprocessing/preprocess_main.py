@@ -3,10 +3,13 @@ import argparse
 from extract_features import main as extract
 from make_splits import main as split
 
+from src.utils.partitions import parse_partition_filters
+
 
 def main(args: argparse.Namespace):
-    extract(args.config_path)
-    split(args.splits, args.config_path)
+    filters = parse_partition_filters(args.filters)
+    extract(args.config_path, filters=filters, max_workers=args.max_workers)
+    split(args.splits, args.config_path, filters=filters, max_workers=args.max_workers)
 
 
 if __name__ == '__main__':
@@ -15,6 +18,10 @@ if __name__ == '__main__':
                         help="How the data should be splitted (train, test) (should sum up to 1)"
                         )
     parser.add_argument("--config_path", type=str, default="configs/data.yaml", help="Path to the data config yaml file")
+    parser.add_argument("--filter", action="append", dest="filters",
+                        help="Partition filter as key=value[,value...] (repeatable), e.g. --filter station=1,2"
+                        )
+    parser.add_argument("--max_workers", type=int, default=None, help="Number of processes used for the partitions")
     arguments = parser.parse_args()
 
     if sum(arguments.splits) != 1:
@@ -0,0 +1,117 @@
+"""
+Streaming tf.data loader for the processed/split csv files.
+Files are read in parallel, lines are shuffled in a bounded buffer, then parsed per batch in parallel.
+Prefetching overlaps the I/O and parsing with the training step, and the whole file never has to be loaded in memory.
+"""
+from pathlib import Path
+from typing import Optional
+
+import tensorflow as tf
+
+from src.preprocessing.extract_constants import target_column
+from src.utils.configs.data_config import DataConfig
+from src.utils.partitions import PartitionFilters, get_partition_configs
+from src.utils.utils import read_csv_header
+
+
+def get_split_paths(
+    cfg: DataConfig,
+    split: str = "train",
+    frequency: str = "hourly",
+    filters: Optional[PartitionFilters] = None,
+) -> list[Path]:
+    """
+    Get the split files of every partition matching the filters (or of the single dataset).
+
+    Args:
+        cfg: The dataset configuration.
+        split: "train" or "test".
+        frequency: "hourly" or "daily".
+        filters: Optional mapping partition key -> accepted values.
+
+    Returns:
+        The split files paths.
+    """
+    path_property = f"{split}_{frequency}_data_path"
+    return [getattr(partition_cfg, path_property) for partition_cfg in get_partition_configs(cfg, "splitted_path", filters)]
+
+
+def make_csv_dataset(
+    paths: list[str | Path],
+    batch_size: int = 256,
+    label_column: str = target_column,
+    feature_columns: Optional[list[str]] = None,
+    shuffle_buffer_size: Optional[int] = 10_000,
+    num_parallel_reads: int = tf.data.AUTOTUNE,
+    seed: Optional[int] = None,
+    cache: bool | str | Path = False,
+    repeat: bool = False,
+) -> tf.data.Dataset:
+    """
+    Build a streaming dataset of (features, label) batches from csv files sharing the same header.
+
+    Args:
+        paths: The csv files.
+        batch_size: Number of records per batch.
+        label_column: The target column.
+        feature_columns: The features to keep, defaults to every column but the label.
+        shuffle_buffer_size: Size of the shuffling buffer in lines, None to keep the files order.
+        num_parallel_reads: Number of files read concurrently.
+        seed: Optional shuffling seed.
+        cache: Cache the parsed batches after the first epoch, in memory (True) or in the given file.
+            Later epochs skip the csv parsing, but reuse the batches of the first epoch (in a shuffled order).
+        repeat: If True, repeat the dataset indefinitely (steps_per_epoch must then be given to fit).
+
+    Returns:
+        Dataset of (features [batch, nb_features], label [batch]) float32 tensors.
+    """
+    if not paths:
+        raise ValueError("No csv file to load")
+
+    # decode_csv relies on the column positions, every file must have the same columns in the same order
+    header = read_csv_header(paths[0])
+    mismatching_paths = [str(path) for path in paths[1:] if read_csv_header(path) != header]
+    if mismatching_paths:
+        raise ValueError(f"Files with a different header than {paths[0]}: {mismatching_paths}")
+
+    feature_columns = feature_columns or [column for column in header if column != label_column]
+
+    missing_columns = [column for column in [*feature_columns, label_column] if column not in header]
+    if missing_columns:
+        raise KeyError(f"Columns {missing_columns} not in {paths[0]} header")
+
+    feature_indices = [header.index(column) for column in feature_columns]
+    label_index = header.index(label_column)
+    record_defaults = [tf.constant([], dtype=tf.float32)] * len(header)
+
+    def parse_batch(lines: tf.Tensor) -> tuple[tf.Tensor, tf.Tensor]:
+        # Decoding a whole batch at once is much cheaper than one line at a time
+        columns = tf.io.decode_csv(lines, record_defaults=record_defaults)
+        features = tf.stack([columns[i] for i in feature_indices], axis=1)
+        return features, columns[label_index]
+
+    files = tf.data.Dataset.from_tensor_slices([str(path) for path in paths])
+    if shuffle_buffer_size:
+        files = files.shuffle(len(paths), seed=seed)
+
+    dataset = files.interleave(
+        lambda path: tf.data.TextLineDataset(path).skip(1),
+        cycle_length=min(len(paths), 16),
+        num_parallel_calls=num_parallel_reads,
+        deterministic=not shuffle_buffer_size,
+    )
+
+    if shuffle_buffer_size:
+        dataset = dataset.shuffle(shuffle_buffer_size, seed=seed, reshuffle_each_iteration=True)
+
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.map(parse_batch, num_parallel_calls=tf.data.AUTOTUNE)
+
+    if cache:
+        dataset = dataset.cache("" if cache is True else str(cache))
+        if shuffle_buffer_size:
+            dataset = dataset.shuffle(max(shuffle_buffer_size // batch_size, 1), seed=seed, reshuffle_each_iteration=True)
+    if repeat:
+        dataset = dataset.repeat()
+
+    return dataset.prefetch(tf.data.AUTOTUNE)
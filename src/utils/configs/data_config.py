@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -15,12 +15,53 @@ class DataConfig:
     dataset_dirname: str
     hourly_csv: str
     daily_csv: str
+    partition_keys: Tuple[str, ...] = ()
+    partition: Tuple[Tuple[str, str], ...] = ()
+    max_workers: Optional[int] = None
 
     def __post_init__(self):
+        # Partition configs are also built when reading, their directories are created by the writers
+        if self.partition:
+            return
         self.extracted_path.mkdir(parents=True, exist_ok=True)
         self.processed_path.mkdir(parents=True, exist_ok=True)
         self.splitted_path.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def is_partitioned(self) -> bool:
+        """
+        True if the config describes the root of a partitioned layout (and not a single partition).
+        """
+        return bool(self.partition_keys) and not self.partition
+
+    @property
+    def partition_values(self) -> Dict[str, str]:
+        return dict(self.partition)
+
+    def for_partition(self, values: Dict[str, Any]) -> "DataConfig":
+        """
+        Get the configuration of a single partition (e.g. {"station": 1, "year": 2011}).
+        All the paths of the returned config point inside the partition directory (station=1/year=2011).
+
+        Args:
+            values: Mapping partition key -> value, must contain every partition key.
+
+        Returns:
+            The partition configuration.
+        """
+        missing_keys = [key for key in self.partition_keys if key not in values]
+        if missing_keys:
+            raise KeyError(f"Missing partition keys: {missing_keys}")
+
+        partition = tuple((key, str(values[key])) for key in self.partition_keys)
+        partition_dirname = "/".join(f"{key}={value}" for key, value in partition)
+
+        return replace(
+            self,
+            dataset_dirname=f"{self.dataset_dirname}/{partition_dirname}",
+            partition=partition,
+        )
+
     @property
     def train_hourly_csv(self) -> str:
         return f"train_{self.hourly_csv}"
@@ -69,6 +110,10 @@ class DataConfig:
     def processed_hourly_data_path(self):
         return self.processed_path / self.hourly_csv
 
+    @property
+    def drift_reference_path(self):
+        return self.splitted_path / "drift_reference.joblib"
+
     @property
     def train_hourly_data_path(self):
         return self.splitted_path / self.train_hourly_csv
@@ -89,6 +134,7 @@ class DataConfig:
 def parse_config(cfg: Dict[str, Any]) -> DataConfig:
     d = cfg["dataset"]
     f = cfg["files"]
+    p = cfg.get("partitioning") or {}
 
     return DataConfig(
         name=d["name"],
@@ -100,5 +146,7 @@ def parse_config(cfg: Dict[str, Any]) -> DataConfig:
         zip_filename=d["zip_filename"],
         dataset_dirname=d["dataset_dirname"],
         hourly_csv=f["hourly_csv"],
-        daily_csv=f["daily_csv"]
+        daily_csv=f["daily_csv"],
+        partition_keys=tuple(p.get("keys") or ()),
+        max_workers=p.get("max_workers"),
     )
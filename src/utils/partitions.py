@@ -0,0 +1,180 @@
+"""
+Helpers for the partitioned dataset layout (e.g. station=<id>/year=<y>).
+Partitions are discovered from the directory names, pruned by key before any file is read,
+and processed in parallel across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from src.utils.configs.data_config import DataConfig
+
+
+PartitionFilters = Dict[str, Iterable[Any]]
+
+
+def parse_partition_filters(filters: Optional[list[str]]) -> PartitionFilters:
+    """
+    Parse command line partition filters.
+
+    Example:
+        Input: ["station=1,2", "year=2011"]
+        Output: {"station": ["1", "2"], "year": ["2011"]}
+    """
+    parsed = {}
+    for f in filters or []:
+        key, sep, values = f.partition("=")
+        if not sep or not key or not values:
+            raise ValueError(f"Invalid partition filter '{f}', expected key=value[,value...]")
+        parsed[key] = values.split(",")
+    return parsed
+
+
+def _allowed_values(filters: Optional[PartitionFilters]) -> Dict[str, set[str]]:
+    allowed = {}
+    for key, values in (filters or {}).items():
+        if isinstance(values, (str, int)):
+            values = [values]
+        allowed[key] = {str(v) for v in values}
+    return allowed
+
+
+def discover_partitions(
+    root: Path,
+    keys: tuple[str, ...],
+    filters: Optional[PartitionFilters] = None,
+) -> list[Dict[str, str]]:
+    """
+    List the partitions found under root, pruning directories that do not match the filters.
+    Pruning happens level by level, so filtered-out subtrees are never walked.
+
+    Args:
+        root: Root of the partitioned layout.
+        keys: Partition keys, in directory nesting order.
+        filters: Optional mapping key -> accepted values.
+
+    Returns:
+        One mapping key -> value per partition, sorted by directory name.
+    """
+    unknown_keys = set(filters or {}) - set(keys)
+    if unknown_keys:
+        raise KeyError(f"Unknown partition keys in filters: {sorted(unknown_keys)}")
+
+    allowed = _allowed_values(filters)
+    partitions = [{}]
+
+    for key in keys:
+        next_partitions = []
+        for partition in partitions:
+            partition_dir = root.joinpath(*(f"{k}={v}" for k, v in partition.items()))
+            if not partition_dir.is_dir():
+                continue
+
+            for child in sorted(partition_dir.iterdir()):
+                name, sep, value = child.name.partition("=")
+                if not child.is_dir() or not sep or name != key:
+                    continue
+                if key in allowed and value not in allowed[key]:
+                    continue
+                next_partitions.append({**partition, key: value})
+        partitions = next_partitions
+
+    return partitions
+
+
+def get_partition_configs(
+    cfg: DataConfig,
+    stage: str = "extracted_path",
+    filters: Optional[PartitionFilters] = None,
+) -> list[DataConfig]:
+    """
+    Get one configuration per partition of a stage of the pipeline.
+    A non-partitioned configuration is returned as is (filters are then rejected).
+
+    Args:
+        cfg: The dataset configuration.
+        stage: The DataConfig path property the partitions are discovered from
+            ("extracted_path", "processed_path" or "splitted_path").
+        filters: Optional mapping key -> accepted values.
+
+    Returns:
+        The partitions configurations.
+    """
+    if filters and not cfg.partition_keys:
+        raise KeyError(f"Unknown partition keys in filters: {sorted(filters)}")
+
+    if not cfg.is_partitioned:
+        return [cfg]
+
+    root = getattr(cfg, stage)
+    return [cfg.for_partition(values) for values in discover_partitions(root, cfg.partition_keys, filters)]
+
+
+def run_partitioned(
+    func: Callable[[DataConfig], Any],
+    cfg: DataConfig,
+    stage: str = "extracted_path",
+    filters: Optional[PartitionFilters] = None,
+    max_workers: Optional[int] = None,
+) -> list[Any]:
+    """
+    Run func on every partition in parallel across a process pool.
+    func must be picklable (i.e. a module level function or a functools.partial of one).
+
+    Args:
+        func: Function processing a single partition configuration.
+        cfg: The dataset configuration.
+        stage: The DataConfig path property the partitions are discovered from.
+        filters: Optional mapping key -> accepted values.
+        max_workers: Number of processes, defaults to the config value (or the number of cores).
+
+    Returns:
+        The results of func, in partition order.
+    """
+    partition_cfgs = get_partition_configs(cfg, stage, filters)
+
+    if not partition_cfgs:
+        raise FileNotFoundError(f"No partition found under {getattr(cfg, stage)} matching {filters}")
+
+    # No pool overhead for a single dataset
+    if len(partition_cfgs) == 1:
+        return [func(partition_cfgs[0])]
+
+    with ProcessPoolExecutor(max_workers=max_workers or cfg.max_workers) as executor:
+        return list(executor.map(func, partition_cfgs))
+
+
+def read_partitions(
+    cfg: DataConfig,
+    path_property: str,
+    filters: Optional[PartitionFilters] = None,
+    stage: str = "processed_path",
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """
+    Read and concatenate a csv file from every partition matching the filters.
+    The partition keys are added as columns.
+
+    Args:
+        cfg: The dataset configuration.
+        path_property: The DataConfig path property of the file to read (e.g. "processed_hourly_data_path").
+        filters: Optional mapping key -> accepted values.
+        stage: The DataConfig path property the partitions are discovered from.
+        read_csv_kwargs: Extra arguments for pd.read_csv.
+
+    Returns:
+        The concatenated dataframe.
+    """
+    frames = []
+    for partition_cfg in get_partition_configs(cfg, stage, filters):
+        df = pd.read_csv(getattr(partition_cfg, path_property), **read_csv_kwargs)
+        for key, value in partition_cfg.partition:
+            df[key] = value
+        frames.append(df)
+
+    if not frames:
+        raise FileNotFoundError(f"No partition found under {getattr(cfg, stage)} matching {filters}")
+
+    return pd.concat(frames, ignore_index=True)
@@ -20,6 +20,11 @@ def save_yaml(yaml_data: Dict[str, Any], path: str | Path) -> None:
         yaml.safe_dump(yaml_data, f, sort_keys=False)
 
 
+def read_csv_header(path: str | Path) -> list[str]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return f.readline().strip().split(",")
+
+
 # --------- Sanity check ---------
 def check_paths_exist(paths: list[Path]):
     missing_paths = []